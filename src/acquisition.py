@@ -1,7 +1,8 @@
 import pandas as pd
 import requests as req
 
-from const import ( REQUESTS,
+from const import ( Column,
+                    REQUESTS,
                     JOBS_PER_PAGE,
                     ROLES,
                   )
@@ -22,7 +23,7 @@ def fill_df(spec_name, country_name, role_nums):
             for page_num in range(number_of_jobs // JOBS_PER_PAGE + 1):
                 found_jobs = extend_jobs(get_jobs(spec_id, region_id, role.search_tag, page_num), region_name)
                 if (found_jobs is not None):
-                    jobs = jobs.extend(found_jobs)
+                    jobs.extend(found_jobs)
     print(f'Search completed. Total number of found jobs - {len(jobs)}')
     return pd.DataFrame(jobs)
 
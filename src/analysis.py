@@ -2,6 +2,7 @@ import numpy as np
 from bs4 import BeautifulSoup
 import string
 import re
+import more_itertools as mit
 
 import nltk
 nltk.download('all')
@@ -18,7 +19,7 @@ from sklearn.model_selection import cross_val_score, train_test_split
 from sklearn.metrics import f1_score
 
 from const import GRADES, ROLES
-from store import native_lang, role_nums
+import store
 
 #region Preliminary processing text via NLP
 
@@ -31,16 +32,16 @@ def process_via_NLP(text):
   # deleting stop words
   eng_stop_words = set(stopwords.words("english"))
   words = [word for word in words if word not in eng_stop_words]
-  native_stop_words = set(stopwords.words(native_lang))
+  native_stop_words = set(stopwords.words(store.native_lang))
   words = [word for word in words if word not in native_stop_words]
 
   # deleting punctuation characters
-  punctuations = list(string.punctuation).extend(['•', '—', '–', '«', '»', "'", '``', '“', '”', '.', '’', '·', '●'])
+  punctuations = list(string.punctuation) + ['•', '—', '–', '«', '»', "'", '``', '“', '”', '.', '’', '·', '●']
   words = [word for word in words if word not in punctuations]
 
   # stemming each word (determining word roots and slicing ends)
   words = [PorterStemmer().stem(word) for word in words]
-  words = [SnowballStemmer(native_lang).stem(word) for word in words]
+  words = [SnowballStemmer(store.native_lang).stem(word) for word in words]
 
   return  ' '.join(words) 
 
@@ -49,12 +50,11 @@ def process_via_NLP(text):
 #region Determining IT professions by keywords
 
 def get_role(job_name):
-  for num in role_nums:
+  for num in store.role_nums:
     role = ROLES[num]
     if (re.search(role.search_tag, job_name, re.I)):
       return role.name
-    else:
-      return 'undefined'
+  return 'undefined'
 
 #endregion
 
@@ -64,8 +64,7 @@ def get_grade(job_name):
   for grade in GRADES:
     if (re.search(grade, job_name, re.I)):
       return grade
-    else:
-      return 'undefined'
+  return 'undefined'
 
 #endregion
 
@@ -106,4 +105,33 @@ def fill_df_with_learned_model(classifier, word_vectorizer, df, training_columns
   df[fillable_column] = classifier.predict(word_vectorizer.transform(X))
   return df
 
-#endregion
\ No newline at end of file
+#endregion
+
+#region Extracting single skills from key skills
+
+# extracting single skills (abbreviations and word collocations) from key skills strings
+def extract_skills(skills):
+
+  # getting a list of abbreviations
+  tokenized_skills = [word_tokenize(skill) for skill in skills]
+  abbrs = []
+  for skill in merge_nested_lists(tokenized_skills):
+    if re.match(r'^[A-Z]*(?:_[A-Z]*)*$', skill):
+      abbrs.append(skill)
+
+  # getting a list of word collocations
+  all_phrases = []
+  for skill in skills:
+    all_phrases.append(["".join(item) for item in mit.split_before(skill, pred = lambda skill: skill.isupper())])
+  phrases = []
+  for phrase in merge_nested_lists(all_phrases):
+    if len(phrase) > 2:
+      phrases.append(phrase.rstrip())
+
+  return abbrs + phrases
+
+# merging multiple nested lists
+def merge_nested_lists(initial_list):
+  return [item for nested_list in initial_list for item in nested_list]
+
+#endregion
@@ -3,6 +3,7 @@ from enum import Enum
 class Column(Enum):
     ID = 'id'
     NAME = 'name'
+    ROLE = 'role'
     DESCRIPTION = 'description'
     KEY_SKILLS = 'key_skills'
     EXPERIENCE = 'experience'
@@ -17,6 +18,9 @@ class Column(Enum):
     REGION = 'region'
     AREA = 'area'
     EMPLOYER = 'employer'
+    DATE = 'date'
+    SKILL = 'skill'
+    COUNT = 'count'
 
 class Country:
     def __init__(self, **attrs):
@@ -37,6 +41,19 @@ REQUESTS = {
 }
 JOBS_PER_PAGE = 100
 
+SNAPSHOTS = {
+    'partitions':'snapshots/partitions',
+    'salary_rollup':'snapshots/salary_rollup.csv',
+    'skill_rollup':'snapshots/skill_rollup.csv',
+    'sketches':'snapshots/sketches',
+}
+SNAPSHOT_DATE_FORMAT = '%Y-%m-%dT%H%M%S'
+QUANTILES = (0.25, 0.5, 0.75)
+
+CHUNK_SIZE = 100000
+SKETCH_K = 200
+TOP_SKILLS_CAPACITY = 100
+
 COUNTRIES = (
     Country(name='Russia', lang='russian', tax_rate=0.13, search_tag='Россия'),
     Country(name='Belarus', lang='belarusian', tax_rate=0.13, search_tag='Беларусь'),
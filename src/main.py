@@ -4,11 +4,13 @@ import tkinter.filedialog as fd
 
 from const import Column, ERR_MES, COUNTRIES, SPEC_NAME
 import store
-from parametrization import select_country, select_roles, get_net_rate, get_currency_rates
+from parametrization import select_country, select_roles, select_snapshot_date, get_net_rate, get_currency_rates
 from acquisition import fill_df
 from normalization import normalize_df
 from analysis import process_via_NLP, build_learning_model, fill_df_with_learned_model, get_grade, get_role
-from visualization import run_visualization
+from visualization import run_visualization, run_approx_visualization
+from snapshots import save_snapshot, get_snapshot_date, run_trend_report, merge_snapshot_sketches
+from sketches import build_sketches
 
 ''' Parsing the career site (www.hh.ru) via public API, selecting jobs
         and analysis of conditions and qualification requirements within IT labour market '''
@@ -40,10 +42,10 @@ def acquire_data(spec_name, country_name, role_nums):
 
     return df
 
-def run_analysis(df):
+def run_analysis(df, snapshot_date = None):
 
     # deleting extra columns, replacing NaN values to 0 and setting column data types to exclude errors during analysis
-    df = df.drop('Unnamed: 0', 1).fillna(0).astype({
+    df = df.drop(columns = 'Unnamed: 0', errors = 'ignore').fillna(0).astype({
                                                         Column.SALARY.value:'int64',
                                                         Column.ROLE.value:'string',
                                                         Column.KEY_SKILLS.value:'string'
@@ -93,6 +95,10 @@ def run_analysis(df):
 
     #endregion
 
+    # saving the graded dataframe as a dated snapshot for trend reports
+    if snapshot_date:
+        save_snapshot(df, snapshot_date)
+
     ''' Data visualization '''
 
     run_visualization(df)
@@ -103,15 +109,34 @@ def main():
     store.role_nums = select_roles()
     num = input('''Choose one of the following analysis options (enter a number):
                     1. acquire new data from www.hh.ru, save and perform analysis
-                    2. perform analysis of saved dataframe
+                    2. perform analysis of saved dataframe (and save it as a snapshot)
+                    3. build trend reports from saved snapshots
+                    4. perform approximate analysis of large CSV-files (streaming by chunks)
+                    5. perform approximate analysis of saved snapshots
                 ''')
     if num == '1':
         store.net_rate = get_net_rate(store.country_num)
         (store.USD_rate, store.EUR_rate) = get_currency_rates()
         df = acquire_data(SPEC_NAME, COUNTRIES[store.country_num].search_tag, store.role_nums)
+        run_analysis(df, get_snapshot_date())
+        return
     elif num == '2':
         print('Select a CSV-file')
-        df = pd.read_csv(fd.askopenfilename(), sep=',')
+        path = fd.askopenfilename()
+        df = pd.read_csv(path, sep=',')
+        # backfilling the snapshot store with previously saved dataframes
+        run_analysis(df, select_snapshot_date(path))
+        return
+    elif num == '3':
+        run_trend_report()
+        return
+    elif num == '4':
+        print('Select one or more CSV-files')
+        run_approx_visualization(build_sketches(fd.askopenfilenames()))
+        return
+    elif num == '5':
+        run_approx_visualization(merge_snapshot_sketches())
+        return
     else:
         print(ERR_MES)
         main()
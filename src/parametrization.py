@@ -1,4 +1,7 @@
-from const import COUNTRIES, ROLES, ERR_MES
+import os
+import datetime
+
+from const import COUNTRIES, ROLES, ERR_MES, SNAPSHOT_DATE_FORMAT
 
 def select_country():
     print('Enter a country number:')
@@ -24,6 +27,18 @@ def get_currency_rates():
         print(ERR_MES)
         return get_currency_rates()
 
+def select_snapshot_date(path):
+    date = input('Enter a crawl date of the dataframe (YYYY-MM-DD) to save it as a snapshot, press Enter to use the file modification time or enter "n" to skip saving: ')
+    if date == '':
+        return datetime.datetime.fromtimestamp(os.path.getmtime(path)).strftime(SNAPSHOT_DATE_FORMAT)
+    if date == 'n':
+        return None
+    try:
+        return datetime.datetime.strptime(date, '%Y-%m-%d').strftime(SNAPSHOT_DATE_FORMAT)
+    except:
+        print(ERR_MES)
+        return select_snapshot_date(path)
+
 def select_roles():
     print('Enter numbers of preferred professions using a separator (dot, comma or gap) or just press Enter to select all ones:')
     all_nums = []
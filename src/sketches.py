@@ -0,0 +1,243 @@
+import math
+import random
+import json
+import heapq
+import pandas as pd
+from collections import Counter
+
+from const import Column, ROLES, CHUNK_SIZE, SKETCH_K, TOP_SKILLS_CAPACITY
+from analysis import extract_skills, process_via_NLP, get_role, get_grade
+
+''' Approximate streaming statistics (salary quantiles and most in-demand skills) built in one pass
+        over chunked input with bounded memory and mergeable across shards and snapshots '''
+
+# columns which salary quantiles are calculated by (if present in the input)
+GROUPING_COLUMNS = (Column.ROLE.value, Column.GRADE.value, Column.REGION.value, Column.EXPERIENCE.value)
+
+ROLE_NAMES = {role.name for role in ROLES}
+
+#region Quantile sketch (KLL)
+
+class KLLSketch:
+    def __init__(self, k = SKETCH_K, c = 2/3):
+        self.k = k
+        self.c = c
+        self.compactors = [[]]
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    # capacity of a compactor at a certain level (the higher level, the larger capacity)
+    def capacity(self, level):
+        return int(math.ceil(self.c ** (len(self.compactors) - level - 1) * self.k)) + 1
+
+    def size(self):
+        return sum(len(compactor) for compactor in self.compactors)
+
+    def max_size(self):
+        return sum(self.capacity(level) for level in range(len(self.compactors)))
+
+    def update(self, values):
+        values = [float(v) for v in values]
+        if not values:
+            return self
+        self.n += len(values)
+        self.min = min(self.min, min(values))
+        self.max = max(self.max, max(values))
+        self.compactors[0].extend(values)
+        self.compress()
+        return self
+
+    # promoting every second sorted item of overflowed compactors to the next level
+    def compress(self):
+        while self.size() >= self.max_size():
+            for level, compactor in enumerate(self.compactors):
+                if len(compactor) >= self.capacity(level):
+                    if level + 1 == len(self.compactors):
+                        self.compactors.append([])
+                    compactor.sort()
+                    kept = [compactor.pop()] if len(compactor) % 2 else []
+                    self.compactors[level + 1].extend(compactor[random.randint(0, 1)::2])
+                    self.compactors[level] = kept
+                    break
+
+    def merge(self, other):
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compress()
+        return self
+
+    def quantile(self, q):
+        if self.n == 0:
+            return math.nan
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        items = sorted((item, 2 ** level) for level, compactor in enumerate(self.compactors) for item in compactor)
+        rank = q * sum(weight for _, weight in items)
+        cum_weight = 0
+        for item, weight in items:
+            cum_weight += weight
+            if cum_weight >= rank:
+                return item
+        return self.max
+
+    def to_dict(self):
+        return { 'k': self.k, 'c': self.c, 'compactors': self.compactors, 'n': self.n, 'min': self.min, 'max': self.max }
+
+    @staticmethod
+    def from_dict(data):
+        sketch = KLLSketch(data['k'], data['c'])
+        sketch.compactors = data['compactors']
+        sketch.n = data['n']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        return sketch
+
+#endregion
+
+#region Top-k sketch (Space-Saving)
+
+class SpaceSavingSketch:
+    def __init__(self, capacity = TOP_SKILLS_CAPACITY):
+        self.capacity = capacity
+        self.counters = {}
+        # min-heap of (count, item) pairs, outdated pairs are skipped lazily
+        self.heap = []
+
+    def update(self, items):
+        # counting duplicated items of a chunk beforehand to update counters once per distinct item
+        for item, count in Counter(items).items():
+            if item in self.counters or len(self.counters) < self.capacity:
+                self.counters[item] = self.counters.get(item, 0) + count
+            else:
+                # replacing the least frequent item and inheriting its count
+                self.counters[item] = self.pop_min() + count
+            heapq.heappush(self.heap, (self.counters[item], item))
+            if len(self.heap) > 2 * self.capacity:
+                self.rebuild_heap()
+        return self
+
+    # removing the least frequent item and returning its count
+    def pop_min(self):
+        while True:
+            count, item = heapq.heappop(self.heap)
+            if self.counters.get(item) == count:
+                del self.counters[item]
+                return count
+
+    def rebuild_heap(self):
+        self.heap = [(count, item) for item, count in self.counters.items()]
+        heapq.heapify(self.heap)
+
+    # the least count of a full sketch (an upper bound of counts of items missing in it)
+    def min_count(self):
+        return min(self.counters.values()) if len(self.counters) >= self.capacity else 0
+
+    # merging summaries (an item missing in one of them gets its least count) and keeping the most frequent items
+    def merge(self, other):
+        self_min, other_min = self.min_count(), other.min_count()
+        counters = { item: self.counters.get(item, self_min) + other.counters.get(item, other_min)
+                     for item in set(self.counters) | set(other.counters) }
+        self.counters = dict(sorted(counters.items(), key = lambda item: item[1], reverse = True)[:self.capacity])
+        self.rebuild_heap()
+        return self
+
+    def top(self, num = 10):
+        return dict(sorted(self.counters.items(), key = lambda item: item[1], reverse = True)[:num])
+
+    def to_dict(self):
+        return { 'capacity': self.capacity, 'counters': self.counters }
+
+    @staticmethod
+    def from_dict(data):
+        sketch = SpaceSavingSketch(data['capacity'])
+        sketch.counters = data['counters']
+        sketch.rebuild_heap()
+        return sketch
+
+#endregion
+
+#region Building sketches over chunked input
+
+class JobSketches:
+    def __init__(self):
+        # salary sketches per each value of grouping columns - { column: { group: KLLSketch } }
+        self.salaries = {}
+        # skill sketches per each profession - { role: SpaceSavingSketch }
+        self.skills = {}
+
+    def update(self, df):
+        # determining professions and grades by raw job names of dataframes saved by acquire_data (without grades)
+        if Column.ROLE.value in df and Column.GRADE.value not in df:
+            job_names = df[Column.ROLE.value].astype(str)
+            df = df.assign(**{ Column.GRADE.value: job_names.apply(get_grade),
+                               Column.ROLE.value: job_names.apply(process_via_NLP).apply(get_role) })
+
+        # keeping sketches for known professions only to bound memory
+        if Column.ROLE.value in df:
+            for role, role_df in df[df[Column.ROLE.value].isin(ROLE_NAMES)].groupby(Column.ROLE.value):
+                skills = extract_skills(role_df[Column.KEY_SKILLS.value].dropna().astype(str).to_list())
+                self.skills.setdefault(role, SpaceSavingSketch()).update(skills)
+
+        # filtering null values by salaries (and by regions for regional salaries) as it is done for visualization
+        df = df[df[Column.SALARY.value].fillna(0) != 0]
+        for col in [col for col in GROUPING_COLUMNS if col in df]:
+            if col == Column.REGION.value:
+                col_df = df[df[Column.REGION.value].astype(str) != '0']
+            elif col == Column.ROLE.value:
+                col_df = df[df[Column.ROLE.value].isin(ROLE_NAMES)]
+            else:
+                col_df = df
+            col_sketches = self.salaries.setdefault(col, {})
+            for group, salaries in col_df.groupby(col)[Column.SALARY.value]:
+                col_sketches.setdefault(group, KLLSketch()).update(salaries.to_list())
+        return self
+
+    def merge(self, other):
+        for col, col_sketches in other.salaries.items():
+            for group, sketch in col_sketches.items():
+                self.salaries.setdefault(col, {}).setdefault(group, KLLSketch()).merge(sketch)
+        for role, sketch in other.skills.items():
+            self.skills.setdefault(role, SpaceSavingSketch()).merge(sketch)
+        return self
+
+    def to_dict(self):
+        return { 'salaries': { col: { group: sketch.to_dict() for group, sketch in col_sketches.items() }
+                               for col, col_sketches in self.salaries.items() },
+                 'skills': { role: sketch.to_dict() for role, sketch in self.skills.items() },
+               }
+
+    @staticmethod
+    def from_dict(data):
+        sketches = JobSketches()
+        sketches.salaries = { col: { group: KLLSketch.from_dict(sketch) for group, sketch in col_sketches.items() }
+                              for col, col_sketches in data['salaries'].items() }
+        sketches.skills = { role: SpaceSavingSketch.from_dict(sketch) for role, sketch in data['skills'].items() }
+        return sketches
+
+# building sketches in one streaming pass over CSV-files (shards) read by chunks
+def build_sketches(paths, chunksize = CHUNK_SIZE):
+    sketches = JobSketches()
+    for path in paths:
+        print(f'Building sketches over {path}...')
+        for chunk in pd.read_csv(path, sep=',', chunksize = chunksize):
+            sketches.update(chunk)
+    return sketches
+
+# saving sketches as plain data (JSON) to keep them readable regardless of later code changes
+def save_sketches(sketches, path):
+    with open(path, 'w', encoding = 'utf-8') as file:
+        json.dump(sketches.to_dict(), file, ensure_ascii = False)
+
+def load_sketches(path):
+    with open(path, 'r', encoding = 'utf-8') as file:
+        return JobSketches.from_dict(json.load(file))
+
+#endregion
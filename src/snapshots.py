@@ -0,0 +1,161 @@
+import os
+import datetime
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from const import Column, ROLES, SNAPSHOTS, SNAPSHOT_DATE_FORMAT, QUANTILES
+import store
+from analysis import extract_skills
+from sketches import JobSketches, build_sketches, save_sketches, load_sketches
+
+''' Storing each crawl as a dated partition and keeping incrementally updated rollups
+        (salary quantiles per role, grade and region and skill counts per role) for trend reports '''
+
+# dimensions which salary quantiles are rolled up by
+SALARY_DIMENSIONS = (Column.ROLE.value, Column.GRADE.value, Column.REGION.value)
+
+#region Saving snapshots and updating rollups
+
+# saving a graded dataframe as a partition dated by the crawl time and appending its rollups
+# (an existing partition is never overwritten)
+def save_snapshot(df, date = None):
+    date = date or get_snapshot_date()
+    if os.path.exists(get_partition_path(date)):
+        print(f'Snapshot dated {date} already exists')
+        return
+    print(f'Saving a snapshot of {len(df)} jobs dated {date}...')
+
+    # calculating rollups and sketches before writing anything to keep a failed snapshot retryable
+    salary_rollup = count_salary_rollup(df, date)
+    skill_rollup = count_skill_rollup(df, date)
+    sketches = JobSketches().update(df)
+
+    append_rollup(SNAPSHOTS['salary_rollup'], salary_rollup)
+    append_rollup(SNAPSHOTS['skill_rollup'], skill_rollup)
+
+    # keeping mergeable sketches of the snapshot for approximate analysis over multiple snapshots
+    os.makedirs(SNAPSHOTS['sketches'], exist_ok = True)
+    save_sketches(sketches, get_sketches_path(date))
+
+    # writing the partition last (via a temporary file) as it marks the snapshot as saved
+    os.makedirs(SNAPSHOTS['partitions'], exist_ok = True)
+    df.to_csv(f'{get_partition_path(date)}.tmp', index = False, header = True, sep=',')
+    os.replace(f'{get_partition_path(date)}.tmp', get_partition_path(date))
+    print('Snapshot saved')
+
+# getting a snapshot date of the current crawl
+def get_snapshot_date():
+    return datetime.datetime.now().strftime(SNAPSHOT_DATE_FORMAT)
+
+# getting salary quantiles per each value of the role, grade and region columns
+def count_salary_rollup(df, date):
+    # filtering null values by salaries (and by regions for regional salaries) as it is done for visualization
+    df = df[df[Column.SALARY.value] != 0]
+    rollups = []
+    for dimension in SALARY_DIMENSIONS:
+        dimension_df = df[df[Column.REGION.value].astype(str) != '0'] if dimension == Column.REGION.value else df
+        grouped = dimension_df.groupby(dimension)[Column.SALARY.value]
+        rollup = grouped.agg(['count', 'mean', 'min', 'max'])
+        for q in QUANTILES:
+            rollup[get_quantile_col(q)] = grouped.quantile(q)
+        rollup = rollup.round(0).rename_axis('group').reset_index()
+        rollup.insert(0, 'dimension', dimension)
+        rollups.append(rollup)
+    rollup = pd.concat(rollups, ignore_index = True)
+    rollup.insert(0, Column.DATE.value, date)
+    return rollup
+
+# counting skills required for each profession
+def count_skill_rollup(df, date):
+    rows = []
+    for role, role_df in df.groupby(Column.ROLE.value):
+        skill_counts = pd.Series(extract_skills(role_df[Column.KEY_SKILLS.value].astype(str).to_list())).value_counts()
+        rows.extend([(date, role, skill, count) for skill, count in skill_counts.items()])
+    return pd.DataFrame(rows, columns = [Column.DATE.value, Column.ROLE.value, Column.SKILL.value, Column.COUNT.value])
+
+# appending rollup rows of a single snapshot without recalculating previous ones
+def append_rollup(path, rollup):
+    rollup.to_csv(path, mode = 'a', index = False, header = not os.path.exists(path), sep=',')
+
+#endregion
+
+#region Loading snapshots
+
+# getting dates (crawl timestamps) of all saved snapshots
+def get_snapshot_dates():
+    if not os.path.isdir(SNAPSHOTS['partitions']):
+        return []
+    return sorted(os.path.splitext(name)[0] for name in os.listdir(SNAPSHOTS['partitions']) if name.endswith('.csv'))
+
+# merging sketches of saved snapshots (all ones by default) without reloading partitions
+def merge_snapshot_sketches(dates = None):
+    sketches = JobSketches()
+    dates = dates or get_snapshot_dates()
+    if not dates:
+        print('No saved snapshots')
+    for date in dates:
+        if os.path.exists(get_sketches_path(date)):
+            sketches.merge(load_sketches(get_sketches_path(date)))
+        else:
+            # building missing sketches over the partition read by chunks
+            sketches.merge(build_sketches([get_partition_path(date)]))
+    return sketches
+
+def get_partition_path(date):
+    return os.path.join(SNAPSHOTS['partitions'], f'{date}.csv')
+
+def get_sketches_path(date):
+    return os.path.join(SNAPSHOTS['sketches'], f'{date}.json')
+
+def get_quantile_col(q):
+    return f'q{round(q * 100)}'
+
+#endregion
+
+#region Building trend reports from rollups
+
+# getting salary quantiles by dates for each value of the role, grade or region column
+def get_salary_trend(dimension, q = 0.5):
+    rollup = pd.read_csv(SNAPSHOTS['salary_rollup'], sep=',')
+    rollup = rollup[rollup['dimension'] == dimension]
+    # skipping rows left by a failed attempt to save the same snapshot
+    rollup = rollup.drop_duplicates([Column.DATE.value, 'group'], keep = 'last')
+    return rollup.pivot(index = Column.DATE.value, columns = 'group', values = get_quantile_col(q)).sort_index()
+
+# getting counts of the most in-demand skills by dates for certain profession
+def get_skill_trend(role, top = 10):
+    rollup = pd.read_csv(SNAPSHOTS['skill_rollup'], sep=',')
+    rollup = rollup[rollup[Column.ROLE.value] == role].drop_duplicates([Column.DATE.value, Column.SKILL.value], keep = 'last')
+    top_skills = rollup.groupby(Column.SKILL.value)[Column.COUNT.value].sum().sort_values(ascending = False).index[:top]
+    rollup = rollup[rollup[Column.SKILL.value].isin(top_skills)]
+    return rollup.pivot(index = Column.DATE.value, columns = Column.SKILL.value, values = Column.COUNT.value).fillna(0).sort_index()
+
+def run_trend_report():
+    if not os.path.exists(SNAPSHOTS['salary_rollup']):
+        print('No saved snapshots')
+        return
+    print(f'Building trend reports from {len(get_snapshot_dates())} snapshots...')
+
+    # median salaries relating to professions, grades and regions
+    for dimension in SALARY_DIMENSIONS:
+        trend = get_salary_trend(dimension)
+        print(trend)
+        plot_trend_chart(trend, f'Median salaries relating to {dimension}s', 'Salary')
+
+    # most in-demand skills relating to IT professions
+    for num in store.role_nums:
+        role_name = ROLES[num].name
+        trend = get_skill_trend(role_name)
+        if not trend.empty:
+            print(trend)
+            plot_trend_chart(trend, f'Top 10 key skills of {role_name}', 'Number of jobs')
+
+# plotting values by dates
+def plot_trend_chart(trend_df, title, label):
+    ax = trend_df.plot(kind = 'line', marker = 'o', figsize = (10, 5))
+    ax.set_xlabel(Column.DATE.value)
+    ax.set_ylabel(label)
+    plt.title(title)
+    plt.show()
+
+#endregion
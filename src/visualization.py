@@ -6,6 +6,8 @@ from collections import Counter
 from operator import itemgetter
 
 from const import Column, ROLES
+from analysis import extract_skills
+import store
 from store import role_nums
 
 #region Calculating and visualizing analytical data
@@ -149,37 +151,34 @@ def run_visualization(df):
 
 #endregion
 
+#region Calculating and visualizing approximate analytical data (via sketches)
+
+def run_approx_visualization(sketches):
+  print('Calculating and visualizing approximate analytical data...')
+
+  # plots "Range/scatter of offered salaries" and median values of salaries
+  # relating to professions, grades, regions and required experience
+  for grouping_col, col_sketches in sketches.salaries.items():
+    plot_approx_box_chart(col_sketches, grouping_col)
+    print(count_approx_median_values(col_sketches))
+
+  """ Most in-demand skills relating to IT professions """
+
+  for num in store.role_nums:
+    role_name = ROLES[num].name
+    if role_name in sketches.skills:
+      plot_pie_chart(sketches.skills[role_name].top(10), set_title(role_name))
+
+#endregion
+
 #region Determining most in-demand skills required by employers
 
 # getting most in-demand skills for certain profession
 def get_top_ten_skills(df, role):
   df = df[df[Column.ROLE.value] == role]
-  skills = df[Column.KEY_SKILLS.value].to_list()
-
-  # getting a list of abbreviations
-  tokenized_skills = [word_tokenize(skill) for skill in skills]
-  abbrs = []
-  for skill in merge_nested_lists(tokenized_skills):
-    if re.match(r'^[A-Z]*(?:_[A-Z]*)*$', skill):
-      abbrs.append(skill)
-
-  # getting a list of word collocations
-  all_phrases = []
-  for skill in skills:
-    all_phrases.append(["".join(item) for item in mit.split_before(skill, pred = lambda skill: skill.isupper())])
-  phrases = []
-  for phrase in merge_nested_lists(all_phrases):
-    if len(phrase) > 2:
-      phrases.append(phrase.rstrip())
-
-  skills = abbrs + phrases
 
   # counting duplicated skills and selecting ten most frequent ones
-  return dict(sorted(dict(Counter(skills)).items(), key = lambda item: item[1], reverse = True)[:10])
-
-# merging multiple nested lists
-def merge_nested_lists(initial_list):
-  return [item for nested_list in initial_list for item in nested_list]
+  return dict(sorted(dict(Counter(extract_skills(df[Column.KEY_SKILLS.value].to_list()))).items(), key = lambda item: item[1], reverse = True)[:10])
 
 def set_title(role):
   return f'Top 10 key skills of {role}'
@@ -214,4 +213,23 @@ def count_mean_values(df, grouping_col, countable_col):
 def count_median_values(df, grouping_col, countable_col):
   return df.groupby(grouping_col)[countable_col].median().round(0).sort_values()
 
+# counting approximate median values from quantile sketches
+def count_approx_median_values(col_sketches):
+  return pd.Series({ group: sketch.quantile(0.5) for group, sketch in col_sketches.items() }).round(0).sort_values()
+
+# plotting a box chart from approximate quantiles (whiskers are minimum and maximum values)
+def plot_approx_box_chart(col_sketches, grouping_col):
+  stats = [{ 'label': group,
+             'whislo': sketch.min,
+             'q1': sketch.quantile(0.25),
+             'med': sketch.quantile(0.5),
+             'q3': sketch.quantile(0.75),
+             'whishi': sketch.max,
+           } for group, sketch in col_sketches.items()]
+  fig, ax = plt.subplots(figsize = (12, max(3, len(stats) / 2)))
+  ax.bxp(stats, vert = False, showfliers = False)
+  ax.set_xlabel(Column.SALARY.value)
+  ax.set_ylabel(grouping_col)
+  plt.show()
+
 #endregion